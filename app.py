@@ -1,12 +1,20 @@
 import io
 import os
 from flask import Flask, render_template, request, jsonify, send_file
-import pandas as pd
+from openpyxl import Workbook, load_workbook
 
-from scoring import compute_scores_for_transcript
+# Optional fast JSON encoder (falls back to flask.jsonify)
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+from scoring import compute_scores_cached, compute_scores_for_transcript_batch
 from rubric_loader import load_rubric
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
+# Reject oversized uploads up front (Flask answers 413) instead of buffering them
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_UPLOAD_MB", "5")) * 1024 * 1024
 
 # Use the workbook path you uploaded in your environment.
 RUBRIC_PATH = "/mnt/data/Case study for interns.xlsx"
@@ -18,6 +26,47 @@ except Exception as e:
     rubric_df = None
     app.logger.warning(f"[WARN] Could not load rubric: {e}")
 
+def _load_rubric_sheets(path):
+    """
+    Read every sheet of the rubric workbook as (sheet_name, rows) so /score_excel
+    can copy them into each report without re-parsing the workbook.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return [
+            ((ws.title or "Sheet")[:31], [tuple(r) for r in ws.iter_rows(values_only=True)])
+            for ws in wb.worksheets
+        ]
+    finally:
+        wb.close()
+
+# Rubric sheets are read once at startup (the workbook doesn't change at runtime)
+_RUBRIC_CACHE = []
+try:
+    if os.path.exists(RUBRIC_PATH):
+        _RUBRIC_CACHE = _load_rubric_sheets(RUBRIC_PATH)
+except Exception as e:
+    app.logger.warning(f"[WARN] Could not cache rubric sheets: {e}")
+
+def _json(obj, status=200):
+    """
+    JSON response encoded with orjson when available (NumPy scalars/arrays serialize natively).
+    """
+    if orjson is None:
+        resp = jsonify(obj)
+        resp.status_code = status
+        return resp
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype="application/json"
+    )
+
+def _read_upload(f):
+    """
+    Decode an uploaded .txt file in a single pass (undecodable bytes are replaced,
+    so there is no seek-and-reread fallback).
+    """
+    return f.read().decode("utf-8", errors="replace").strip()
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -36,22 +85,60 @@ def score():
     duration_raw = request.form.get("duration_seconds", "").strip()
 
     if uploaded_file and uploaded_file.filename:
-        try:
-            text = uploaded_file.read().decode("utf-8").strip()
-        except Exception:
-            uploaded_file.seek(0)
-            text = uploaded_file.read().decode("latin-1").strip()
+        text = _read_upload(uploaded_file)
 
     if not text:
-        return jsonify({"error": "No transcript provided (paste text or upload a .txt file)."}), 400
+        return _json({"error": "No transcript provided (paste text or upload a .txt file)."}, 400)
 
     try:
         duration_seconds = float(duration_raw) if duration_raw else None
     except Exception:
         duration_seconds = None
 
-    out_json, _ = compute_scores_for_transcript(text, duration_seconds=duration_seconds)
-    return jsonify(out_json)
+    out_json, _ = compute_scores_cached(text, duration_seconds=duration_seconds)
+    return _json(out_json)
+
+# Upper bound on transcripts per /score_batch request
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "64"))
+
+@app.route("/score_batch", methods=["POST"])
+def score_batch():
+    """
+    Accepts JSON:
+      - "transcripts": list of transcript strings
+      - optional "duration_seconds": list of durations (seconds or null), same length as transcripts
+    Returns a JSON list with one /score-style result per transcript, in order.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return _json({"error": "Request body must be a JSON object."}, 400)
+    texts = payload.get("transcripts")
+    if not isinstance(texts, list) or not texts:
+        return _json({"error": "Provide a non-empty 'transcripts' list."}, 400)
+    if len(texts) > MAX_BATCH_SIZE:
+        return _json({"error": f"At most {MAX_BATCH_SIZE} transcripts per batch."}, 400)
+    bad = [i for i, t in enumerate(texts) if not isinstance(t, str)]
+    if bad:
+        return _json({"error": f"Transcript at index {bad[0]} is not a string."}, 400)
+    texts = [t.strip() for t in texts]
+    empty = [i for i, t in enumerate(texts) if not t]
+    if empty:
+        return _json({"error": f"Empty transcript at index {empty[0]}."}, 400)
+
+    durations_raw = payload.get("duration_seconds")
+    if durations_raw is None:
+        durations_raw = [None] * len(texts)
+    if not isinstance(durations_raw, list) or len(durations_raw) != len(texts):
+        return _json({"error": "'duration_seconds' must be a list with one entry per transcript."}, 400)
+    durations = []
+    for d in durations_raw:
+        try:
+            durations.append(float(d) if d not in (None, "") else None)
+        except Exception:
+            durations.append(None)
+
+    results = compute_scores_for_transcript_batch(texts, durations)
+    return _json([out_json for out_json, _ in results])
 
 @app.route("/score_excel", methods=["POST"])
 def score_excel():
@@ -63,38 +150,34 @@ def score_excel():
     duration_raw = request.form.get("duration_seconds", "").strip()
 
     if uploaded_file and uploaded_file.filename:
-        try:
-            text = uploaded_file.read().decode("utf-8").strip()
-        except Exception:
-            uploaded_file.seek(0)
-            text = uploaded_file.read().decode("latin-1").strip()
+        text = _read_upload(uploaded_file)
 
     if not text:
-        return jsonify({"error": "No transcript provided (paste text or upload a .txt file)."}), 400
+        return _json({"error": "No transcript provided (paste text or upload a .txt file)."}, 400)
 
     try:
         duration_seconds = float(duration_raw) if duration_raw else None
     except Exception:
         duration_seconds = None
 
-    out_json, df_out = compute_scores_for_transcript(text, duration_seconds=duration_seconds)
+    out_json, df_out = compute_scores_cached(text, duration_seconds=duration_seconds)
 
-    # Create Excel in-memory and send
-    buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        # Write original rubric sheets if available
-        try:
-            if os.path.exists(RUBRIC_PATH):
-                original = pd.read_excel(RUBRIC_PATH, sheet_name=None, engine="openpyxl")
-                for sheet_name, sheet_df in original.items():
-                    safe_name = sheet_name[:31] if sheet_name else "Sheet"
-                    sheet_df.to_excel(writer, sheet_name=safe_name, index=False)
-        except Exception:
-            pass
+    # Create Excel in-memory (write-only workbook: rows are streamed, no pandas writer) and send
+    wb = Workbook(write_only=True)
+    # Copy the cached rubric sheets (if any) straight into the workbook
+    for sheet_name, rows in _RUBRIC_CACHE:
+        ws = wb.create_sheet(sheet_name)
+        for row in rows:
+            ws.append(row)
 
-        # Write results sheet (df_out already contains sentence count and duration rows)
-        df_out.to_excel(writer, sheet_name="Results", index=False)
+    # Write results sheet (df_out already contains sentence count and duration rows)
+    ws = wb.create_sheet("Results")
+    ws.append(list(df_out.columns))
+    for row in df_out.itertuples(index=False, name=None):
+        ws.append(row)
 
+    buf = io.BytesIO()
+    wb.save(buf)
     buf.seek(0)
 
     return send_file(
@@ -1,18 +1,26 @@
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 
 def load_rubric(path="Case study for interns.xlsx"):
     """
     Loads the rubric workbook (if present). Returns the first rubric-like sheet as a DataFrame.
+    The workbook is read with openpyxl in read-only mode (rows are streamed, not the whole XML tree);
+    pandas is only used to build the final DataFrame.
     """
-    xls = pd.ExcelFile(path, engine="openpyxl")
-    # try to find a sheet named 'Rubrics' or similar
-    target = None
-    for s in xls.sheet_names:
-        if 'rubric' in s.lower():
-            target = s
-            break
-    if not target:
-        target = xls.sheet_names[0]
-    df = pd.read_excel(path, sheet_name=target, engine="openpyxl")
-    df.columns = [str(c).strip() for c in df.columns]
-    return df
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        # try to find a sheet named 'Rubrics' or similar
+        target = next((s for s in wb.sheetnames if 'rubric' in s.lower()), wb.sheetnames[0])
+        rows = list(wb[target].values)
+    finally:
+        wb.close()
+    # drop trailing empty rows / columns and use NaN for blanks (as pd.read_excel does)
+    while rows and all(c is None for c in rows[-1]):
+        rows.pop()
+    if not rows:
+        return pd.DataFrame()
+    width = max((i + 1 for r in rows for i, c in enumerate(r) if c is not None), default=0)
+    rows = [r[:width] for r in rows]
+    header = [str(c).strip() if c is not None else f"Unnamed: {i}" for i, c in enumerate(rows[0])]
+    return pd.DataFrame(rows[1:], columns=header).replace({None: np.nan}).infer_objects()
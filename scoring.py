@@ -1,35 +1,279 @@
+import os
 import re
 import math
+import hashlib
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
-# Optional libraries (we attempt to import; if missing we fall back to heuristics)
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    _vader = SentimentIntensityAnalyzer()
-except Exception:
-    _vader = None
+def _text_digest(text):
+    """16-byte blake2b digest of text, used as a cache key instead of the text itself."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+class _DigestCache:
+    """
+    Small thread-safe LRU keyed by a digest of the input, so cached entries never keep
+    the (possibly multi-MB) transcript alive. compute runs outside the lock.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+# Optional libraries (we attempt to import; if missing we fall back to heuristics).
+# VADER and LanguageTool (which starts a JVM) are created on first use, not at import,
+# so processes that never score anything don't pay for them.
+_vader = None
+_vader_loaded = False
+_vader_lock = threading.Lock()
+
+def _get_vader():
+    """VADER analyzer, created once on first use (None if vaderSentiment is unavailable)."""
+    global _vader, _vader_loaded
+    if not _vader_loaded:
+        with _vader_lock:
+            if not _vader_loaded:
+                try:
+                    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                    _vader = SentimentIntensityAnalyzer()
+                except Exception:
+                    _vader = None
+                _vader_loaded = True
+    return _vader
+
+# LT_REMOTE_SERVER (e.g. http://localhost:8081) points every worker at one shared
+# LanguageTool server instead of each process starting its own JVM.
+_LT_REMOTE_SERVER = os.environ.get("LT_REMOTE_SERVER", "").strip() or None
+_lt_tool = None
+_lt_loaded = False
+_lt_lock = threading.Lock()
+
+def _get_lt():
+    """LanguageTool instance, created once on first use (None if unavailable)."""
+    global _lt_tool, _lt_loaded
+    if not _lt_loaded:
+        with _lt_lock:
+            if not _lt_loaded:
+                try:
+                    import language_tool_python
+                    if _LT_REMOTE_SERVER:
+                        _lt_tool = language_tool_python.LanguageTool('en-US', remote_server=_LT_REMOTE_SERVER)
+                    else:
+                        # let the local LanguageTool server cache sentence analysis across requests
+                        _lt_tool = language_tool_python.LanguageTool(
+                            'en-US', config={'cacheSize': 10000, 'pipelineCaching': True}
+                        )
+                except Exception:
+                    _lt_tool = None
+                _lt_loaded = True
+    return _lt_tool
 
 try:
-    import language_tool_python
-    _lt_tool = language_tool_python.LanguageTool('en-US')
+    import ahocorasick
 except Exception:
-    _lt_tool = None
+    ahocorasick = None
 
 # Optional semantic model used only for extra feedback (not required)
 _sem_model = None
 _sem_util = None
-def _load_semantic_model():
-    global _sem_model, _sem_util
-    if _sem_model is None:
+# the reference text never changes, so its (normalized) embedding is computed once at load
+_REF_TEXT = "Introduction/self introduction content expected"
+_REF_EMB = None
+# transcripts shorter than this many words skip the transformer
+_SEM_MIN_WORDS = 5
+_SEM_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+# where the int8-quantized ONNX export is written on first load (and reused afterwards)
+_SEM_ONNX_DIR = os.environ.get(
+    "SEM_ONNX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".onnx_minilm_int8")
+)
+_SEM_ONNX_FILE = "model_quantized.onnx"
+# reference embedding stored next to the export so a pre-fork master needn't build a session
+_SEM_ONNX_REF_FILE = "reference_embedding.npz"
+
+class _OnnxSentenceEncoder:
+    """
+    Minimal stand-in for SentenceTransformer.encode backed by an int8 ONNX model:
+    mean pooling over token embeddings followed by L2 normalization (as all-MiniLM-L6-v2 does).
+    Returns NumPy arrays.
+    load_model builds the ONNX Runtime model. It is called lazily by the first encode in
+    each process, so a pre-fork master never builds one and every forked worker gets its
+    own (onnxruntime sessions and their thread pools don't survive fork).
+    """
+    # SentenceTransformer's max_seq_length for all-MiniLM-L6-v2 (the tokenizer itself allows 512)
+    max_seq_length = 256
+
+    def __init__(self, load_model, tokenizer):
+        self._load_model = load_model
+        self._lock = threading.Lock()
+        self.model = None
+        self._pid = None
+        self.tokenizer = tokenizer
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, **kwargs):
+        pid = os.getpid()
+        if self._pid != pid:
+            # first encode in this process: build the session once, even with threaded workers
+            with self._lock:
+                if self._pid != pid:
+                    self.model = self._load_model()
+                    self._pid = pid
+        return self._encode(self.model, sentences, batch_size, normalize_embeddings)
+
+    def encode_transient(self, sentences, batch_size=32, normalize_embeddings=False):
+        """encode with a throwaway session; nothing is kept in this process."""
+        return self._encode(self._load_model(), sentences, batch_size, normalize_embeddings)
+
+    def _encode(self, model, sentences, batch_size, normalize_embeddings):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        chunks = []
+        for i in range(0, len(texts), batch_size):
+            enc = self.tokenizer(texts[i:i + batch_size], padding=True, truncation=True,
+                                 max_length=self.max_seq_length, return_tensors="np")
+            hidden = model(**enc).last_hidden_state
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled.astype(np.float32))
+        embs = np.concatenate(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+        return embs[0] if single else embs
+
+def _load_onnx_encoder():
+    """
+    Export the sentence-transformer to ONNX and apply dynamic int8 quantization
+    (done once; the quantized model is cached in _SEM_ONNX_DIR). Requires optimum[onnxruntime].
+    The export is written to a temporary directory and renamed into place, so other
+    processes never see a half-written _SEM_ONNX_DIR.
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    if not os.path.exists(os.path.join(_SEM_ONNX_DIR, _SEM_ONNX_FILE)):
+        parent = os.path.dirname(os.path.abspath(_SEM_ONNX_DIR))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".onnx_export_", dir=parent)
         try:
-            from sentence_transformers import SentenceTransformer, util
-            _sem_model = SentenceTransformer("all-MiniLM-L6-v2")
-            _sem_util = util
-        except Exception:
-            _sem_model = None
-            _sem_util = None
+            fp32 = ORTModelForFeatureExtraction.from_pretrained(_SEM_MODEL_ID, export=True)
+            quantizer = ORTQuantizer.from_pretrained(fp32)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+            AutoTokenizer.from_pretrained(_SEM_MODEL_ID).save_pretrained(tmp_dir)
+            try:
+                os.rename(tmp_dir, _SEM_ONNX_DIR)
+            except OSError:
+                # another process finished its export first; use that one
+                if not os.path.exists(os.path.join(_SEM_ONNX_DIR, _SEM_ONNX_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    def load_model():
+        return ORTModelForFeatureExtraction.from_pretrained(
+            _SEM_ONNX_DIR, file_name=_SEM_ONNX_FILE, provider="CPUExecutionProvider"
+        )
+    tokenizer = AutoTokenizer.from_pretrained(_SEM_ONNX_DIR)
+    return _OnnxSentenceEncoder(load_model, tokenizer)
+
+def _onnx_reference_embedding(encoder):
+    """
+    Normalized embedding of _REF_TEXT for the ONNX encoder, read from _SEM_ONNX_DIR when
+    available; otherwise computed with a throwaway session and saved there for next time.
+    """
+    path = os.path.join(_SEM_ONNX_DIR, _SEM_ONNX_REF_FILE)
+    try:
+        with np.load(path) as data:
+            if str(data["text"]) == _REF_TEXT:
+                return data["emb"]
+    except Exception:
+        pass
+    emb = encoder.encode_transient(_REF_TEXT, normalize_embeddings=True)
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".npz", dir=_SEM_ONNX_DIR)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, text=_REF_TEXT, emb=emb)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+    return emb
+
+_sem_loaded = False
+_sem_lock = threading.Lock()
+
+def _load_semantic_model():
+    """
+    Load the semantic model once (a failed load is not retried on every request).
+    Returns (model, util); model is None when no backend is available.
+    """
+    global _sem_model, _sem_util, _REF_EMB, _sem_loaded
+    if not _sem_loaded:
+        with _sem_lock:
+            if not _sem_loaded:
+                model, util, ref_emb = None, None, None
+                # prefer the quantized ONNX model; fall back to the FP32 sentence-transformer
+                try:
+                    model = _load_onnx_encoder()
+                except Exception:
+                    try:
+                        from sentence_transformers import SentenceTransformer, util
+                        model = SentenceTransformer("all-MiniLM-L6-v2")
+                    except Exception:
+                        model, util = None, None
+                try:
+                    if isinstance(model, _OnnxSentenceEncoder):
+                        ref_emb = _onnx_reference_embedding(model)
+                    elif model is not None:
+                        ref_emb = model.encode(_REF_TEXT, convert_to_tensor=True, normalize_embeddings=True)
+                except Exception:
+                    model, util, ref_emb = None, None, None
+                _sem_model, _sem_util, _REF_EMB = model, util, ref_emb
+                _sem_loaded = True
     return _sem_model, _sem_util
 
+def warmup():
+    """
+    Load the heavy shared state up front. Call it in the parent before workers fork
+    (gunicorn --preload, see wsgi.py) so they inherit it copy-on-write: VADER (and, with
+    VADER_FAST, its lexicon table) and the semantic backend's shared parts. For the ONNX
+    backend that is the export/quantize (done once here), the tokenizer and the reference
+    embedding; the ONNX Runtime session itself is built lazily in each worker, since it
+    can't survive fork. For the FP32 sentence-transformer fallback the weights are shared.
+    The marker automaton is already built at import. LanguageTool is only created here
+    when LT_REMOTE_SERVER is set; a local JVM server can't be shared across forks, so it
+    stays lazy per worker.
+    """
+    _load_semantic_model()
+    _get_vader()
+    if _VADER_FAST:
+        _get_vader_lexicon()
+    if _LT_REMOTE_SERVER:
+        _get_lt()
+
+_embed_cache = _DigestCache(maxsize=256)
+
+def _embed_text(text):
+    """Normalized embedding of text (cached per transcript digest)."""
+    return _embed_cache.get_or_compute(
+        _text_digest(text),
+        lambda: _sem_model.encode(text, convert_to_tensor=True, normalize_embeddings=True),
+    )
+
 # Filler words list for clarity metric
 _FILLER_WORDS = set([
     "um","uh","like","you know","so","actually","basically","right","i mean",
@@ -66,40 +310,121 @@ def _normalize_keywords(raw_list):
 
 _CONTENT_KEYWORDS_MUST = _normalize_keywords(_CONTENT_KEYWORDS_MUST)
 
-# util: tokenize words
-def _word_tokens(text):
-    return re.findall(r"\b\w+\b", str(text).lower())
+# Precompiled patterns (compiled once at import instead of on every request)
+_WORD_RE = re.compile(r"\b\w+\b")
+# a sentence = a run between . ! ? separators containing at least one non-space character
+_SENT_COUNT_RE = re.compile(r"[^.!?\s][^.!?]*")
+_REPEAT_RE = re.compile(r"\b(\w+)\s+\1\b")
+_CONTRACTION_RE = re.compile(r"\b(?:dont|doesnt|isnt|cant|wont|shouldnt|couldnt|wouldnt)\b")
+# one alternation for all fillers (longest first so multi-word fillers win)
+_FILLER_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(f) for f in sorted(_FILLER_WORDS, key=len, reverse=True)) + r")\b"
+)
+
+# the helpers below take the token list / set produced once per transcript
+def _word_count_t(tokens):
+    return len(tokens)
+
+def _ttr_from_tokens(tokens, token_set):
+    if not tokens:
+        return 0.0
+    return len(token_set) / len(tokens)
+
+# Salutation phrases by band (checked in list order)
+_SALUTATION_EXCELLENT = ["i am excited to introduce", "i'm excited to introduce"]
+_SALUTATION_GOOD = ["good morning", "good afternoon", "good evening", "good day"]
+_SALUTATION_NORMAL = ["hi ", "hello ", "hi,", "hello,"]
+
+# Flow markers: first occurrence of any marker in a group gives that group's position
+_FLOW_MARKERS = {
+    "salutation": ["hi","hello","good morning","good afternoon","good evening","good day","i am excited"],
+    "name": ["name","i am","i'm","my name is"],
+    "age": ["age","years old"],
+    "school": ["school","class","college"],
+    "additional": ["hobbies","interest","hobby","fun fact","strength","achievement","ambition","goal","dream"],
+    "closing": ["thank you","thanks for listening","thank you for listening","thankyou"]
+}
 
-def _word_count(text):
-    return len(_word_tokens(text))
+def _build_marker_phrases():
+    """
+    Map every marker phrase to the (category, canonical) tags it reports.
+    Categories: "keyword" (canonical = keyword), "salutation" (canonical = phrase),
+    "flow" (canonical = flow group), "filler" (canonical = filler word).
+    """
+    phrases = {}
+    def add(phrase, category, canonical):
+        phrases.setdefault(phrase, []).append((category, canonical))
+    for kw in _CONTENT_KEYWORDS_MUST:
+        add(kw, "keyword", kw)
+    for g in _SALUTATION_EXCELLENT + _SALUTATION_GOOD + _SALUTATION_NORMAL:
+        add(g, "salutation", g)
+    for group, kws in _FLOW_MARKERS.items():
+        for kw in kws:
+            add(kw, "flow", group)
+    # no filler occurs inside another as a whole word, so counting every whole-word
+    # hit gives the same count as the non-overlapping _FILLER_RE scan
+    for f in _FILLER_WORDS:
+        add(f, "filler", f)
+    return phrases
 
-def _unique_word_count(text):
-    toks = _word_tokens(text)
-    return len(set(toks))
+_MARKER_PHRASES = _build_marker_phrases()
 
-def _ttr(text):
-    toks = _word_tokens(text)
-    if not toks:
-        return 0.0
-    return len(set(toks)) / len(toks)
+# single automaton over all marker phrases (None -> per-phrase str.find fallback)
+_marker_automaton = None
+if ahocorasick is not None:
+    _marker_automaton = ahocorasick.Automaton()
+    for _phrase, _tags in _MARKER_PHRASES.items():
+        _marker_automaton.add_word(_phrase, (len(_phrase), tuple(_tags)))
+    _marker_automaton.make_automaton()
+
+def _is_word_char(c):
+    # same characters as the regex \w
+    return c.isalnum() or c == "_"
 
-def _detect_keywords(text, keywords):
+def _scan_markers(txt_lower):
+    """
+    Find every marker phrase in one sweep over the lowercased transcript.
+    Returns {category: {canonical: first_index}}, except "filler" which maps
+    filler word -> number of whole-word occurrences.
+    """
+    hits = {"keyword": {}, "salutation": {}, "flow": {}, "filler": {}}
+    fillers = hits["filler"]
+    def record(start, tags):
+        for category, canonical in tags:
+            if category == "filler":
+                continue
+            prev = hits[category].get(canonical)
+            if prev is None or start < prev:
+                hits[category][canonical] = start
+    if _marker_automaton is not None:
+        last = len(txt_lower) - 1
+        for end, (length, tags) in _marker_automaton.iter(txt_lower):
+            start = end - length + 1
+            record(start, tags)
+            # fillers only count as whole words (like \bfiller\b)
+            if (start == 0 or not _is_word_char(txt_lower[start - 1])) and \
+                    (end == last or not _is_word_char(txt_lower[end + 1])):
+                for category, canonical in tags:
+                    if category == "filler":
+                        fillers[canonical] = fillers.get(canonical, 0) + 1
+    else:
+        for phrase, tags in _MARKER_PHRASES.items():
+            start = txt_lower.find(phrase)
+            if start >= 0:
+                record(start, tags)
+        for f in _FILLER_RE.findall(txt_lower):
+            fillers[f] = fillers.get(f, 0) + 1
+    return hits
+
+def _detect_keywords(marker_hits, keywords):
     """
     Return list of keywords found from keywords (token exact or substring)
+    marker_hits is the result of _scan_markers for the transcript.
     """
-    txt_lower = text.lower()
-    tokens = set(_word_tokens(text))
-    found = []
-    for kw in keywords:
-        kw_l = kw.lower()
-        # exact token or substring
-        if kw_l in tokens:
-            found.append(kw)
-        elif kw_l in txt_lower:
-            found.append(kw)
-    return found
+    kw_hits = marker_hits["keyword"]
+    return [kw for kw in keywords if kw.lower() in kw_hits]
 
-def _compute_salutation_score(text):
+def _compute_salutation_score(marker_hits):
     """
     Salutation bands:
       - No salutation: 0
@@ -107,59 +432,35 @@ def _compute_salutation_score(text):
       - Good (Good Morning, Good Afternoon...): 4
       - Excellent: includes "I am excited to introduce" or "I am excited to introduce myself": 5
     Max = 5 (rubric)
+    marker_hits is the result of _scan_markers for the transcript.
     """
-    txt = text.lower()
-    if "i am excited to introduce" in txt or "i'm excited to introduce" in txt:
+    found = marker_hits["salutation"]
+    if any(g in found for g in _SALUTATION_EXCELLENT):
         return 5, "Excellent salutation phrase found."
     # check good greetings
-    for g in ["good morning", "good afternoon", "good evening", "good day"]:
-        if g in txt:
+    for g in _SALUTATION_GOOD:
+        if g in found:
             return 4, f"Found greeting '{g}'."
     # normal
-    for g in ["hi ", "hello ", "hi,", "hello,"]:
-        if g in txt:
+    for g in _SALUTATION_NORMAL:
+        if g in found:
             return 2, f"Found greeting '{g.strip()}'."
     return 0, "No salutation detected."
 
-def _compute_flow_score(text):
+# consider flow good if salutation < name/age < additional < closing (where present)
+_FLOW_ORDER = ("salutation","name","age","school","additional","closing")
+
+def _compute_flow_score(marker_hits):
     """
     Flow: order followed (Salutation -> Basic details (name, age, class/school) -> Additional -> Closing)
     If order roughly matches, award 5, else 0.
     We'll approximate by trying to locate keyword positions and checking order.
+    marker_hits is the result of _scan_markers for the transcript.
     """
-    txt = text.lower()
-    tokens = _word_tokens(txt)
-    positions = {}
-    # keywords to check for order positions
-    order_keys = {
-        "salutation": ["hi","hello","good morning","good afternoon","good evening","good day","i am excited"],
-        "name": ["name","i am","i'm","my name is"],
-        "age": ["age","i am \d","i'm \d","years old"],
-        "school": ["school","class","college"],
-        "additional": ["hobbies","interest","hobby","fun fact","strength","achievement","ambition","goal","dream"],
-        "closing": ["thank you","thanks for listening","thank you for listening","thankyou"]
-    }
-    # find first occurrence index for each marker
-    idx_map = {}
-    for k, kws in order_keys.items():
-        idx_map[k] = None
-        for kw in kws:
-            m = re.search(re.escape(kw), txt)
-            if m:
-                idx = m.start()
-                if idx_map[k] is None or idx < idx_map[k]:
-                    idx_map[k] = idx
-    # consider flow good if salutation < name/age < additional < closing (where present)
-    order_sequence = ["salutation","name","age","school","additional","closing"]
-    prev_idx = -1
-    satisfied = True
-    for key in order_sequence:
-        idx = idx_map.get(key)
-        if idx is not None:
-            if idx < prev_idx:
-                satisfied = False
-                break
-            prev_idx = idx
+    # first occurrence index for each marker group
+    idx_map = marker_hits["flow"]
+    seq = [idx_map[k] for k in _FLOW_ORDER if k in idx_map]
+    satisfied = all(seq[i] <= seq[i + 1] for i in range(len(seq) - 1))
     return (5 if satisfied else 0), ("Flow followed" if satisfied else "Flow not followed / out of order")
 
 def _compute_wpm(word_count, duration_seconds):
@@ -169,6 +470,12 @@ def _compute_wpm(word_count, duration_seconds):
     # fallback: assume duration 60s if not provided -> WPM = words per minute if text delivered in ~60s
     return word_count
 
+# Score bands as lookup tables: points[np.searchsorted(thresholds, value, side)]
+# gives the band's points without an if/elif ladder (and works on arrays of values too).
+_WPM_TH = np.array([81, 111, 141, 161])
+_WPM_PTS = np.array([0, 6, 10, 6, 2])
+_WPM_MSG = ("Too slow", "Slow", "Ideal", "Fast", "Too fast")
+
 def _score_speech_rate(wpm):
     """
     Bands:
@@ -178,131 +485,181 @@ def _score_speech_rate(wpm):
     81-110 -> 6
     <80 -> 0
     """
-    if wpm >= 161:
-        return 2, "Too fast"
-    if 141 <= wpm < 161:
-        return 6, "Fast"
-    if 111 <= wpm < 141:
-        return 10, "Ideal"
-    if 81 <= wpm < 111:
-        return 6, "Slow"
-    return 0, "Too slow"
+    idx = int(np.searchsorted(_WPM_TH, wpm, side="right"))
+    return int(_WPM_PTS[idx]), _WPM_MSG[idx]
+
+# rules that don't count as grammar issues
+_LT_IGNORED_RULES = frozenset(["WHITESPACE_RULE"])
 
-def _count_grammar_errors(text):
+_lt_count_cache = _DigestCache(maxsize=1024)
+
+def _lt_error_count(text):
     """
-    Use language_tool_python if available to count grammar rule violations per 100 words.
-    If not available, use a simple heuristic: detect multiple common error patterns (very rough).
-    Returns errors_per_100_words (float)
+    Number of language-tool matches for text. Cached by digest so re-scoring the same
+    transcript (e.g. Score then Download Excel) skips the LanguageTool roundtrip.
     """
-    wc = _word_count(text)
-    if wc == 0:
-        return 0.0, "No words"
-    if _lt_tool is not None:
-        matches = _lt_tool.check(text)
-        # filter out punctuation-only matches
+    def check():
+        matches = _get_lt().check(text)
         errors = 0
         for m in matches:
             # robustly support both rule_id and ruleId names across versions
             rule = getattr(m, "rule_id", None) or getattr(m, "ruleId", None)
-            if rule and rule != "WHITESPACE_RULE":
+            if rule and rule not in _LT_IGNORED_RULES:
                 errors += 1
+        return errors
+    return _lt_count_cache.get_or_compute(_text_digest(text), check)
+
+def _count_grammar_errors(text, txt_lower, wc):
+    """
+    Use language_tool_python if available to count grammar rule violations per 100 words.
+    If not available, use a simple heuristic: detect multiple common error patterns (very rough).
+    txt_lower is the lowercased transcript (used by the heuristic), wc its word count.
+    Returns errors_per_100_words (float)
+    """
+    if wc == 0:
+        return 0.0, "No words"
+    if _get_lt() is not None:
+        errors = _lt_error_count(text)
         per100 = (errors / wc) * 100.0
         return per100, f"{errors} grammar issues detected by language-tool"
     # heuristic fallback: count occurrences of repeated words like "the the", common contractions without apostrophe, simple punctuation errors
     errors = 0
     # repeated words
-    repeated = re.findall(r"\b(\w+)\s+\1\b", text.lower())
+    repeated = _REPEAT_RE.findall(txt_lower)
     errors += len(repeated)
     # simplistic missing apostrophe contractions: e.g., dont, isnt -> count occurrences of common words without apostrophe
-    errors += len(re.findall(r"\b(dont|doesnt|isnt|cant|wont|shouldnt|couldnt|wouldnt)\b", text.lower()))
+    errors += len(_CONTRACTION_RE.findall(txt_lower))
     per100 = (errors / wc) * 100.0
     return per100, f"{errors} heuristic grammar issues (fallback)"
 
+_GRAMMAR_TH = np.array([0.3, 0.5, 0.7, 0.9])
+_GRAMMAR_PTS = np.array([10, 8, 6, 4, 2])
+
 def _score_grammar_errors(per100):
     """
     Map errors per 100 words to grammar points (according rubric section):
     ...
     """
     r = per100 / 100.0
-    if r < 0.3:
-        return 10
-    if r < 0.5:
-        return 8
-    if r < 0.7:
-        return 6
-    if r < 0.9:
-        return 4
-    return 2
+    return int(_GRAMMAR_PTS[np.searchsorted(_GRAMMAR_TH, r, side="right")])
+
+# shared by TTR and sentiment: >= 0.9 / 0.7 / 0.5 / 0.3 bands
+_RATIO_TH = np.array([0.3, 0.5, 0.7, 0.9])
+_TTR_PTS = np.array([2, 4, 6, 8, 10])
 
 def _score_ttr(ttr_val):
     """
     TTR bands:
     ...
     """
-    if ttr_val >= 0.9:
-        return 10
-    if ttr_val >= 0.7:
-        return 8
-    if ttr_val >= 0.5:
-        return 6
-    if ttr_val >= 0.3:
-        return 4
-    return 2
-
-def _filler_rate(text):
-    toks = _word_tokens(text)
-    if not toks:
+    return int(_TTR_PTS[np.searchsorted(_RATIO_TH, ttr_val, side="right")])
+
+def _filler_rate(marker_hits, wc):
+    """
+    Filler words per 100 words; marker_hits is the result of _scan_markers for the transcript.
+    """
+    if not wc:
         return 0.0, 0
-    count = 0
-    txt = text.lower()
-    for f in _FILLER_WORDS:
-        count += len(re.findall(r"\b" + re.escape(f) + r"\b", txt))
-    rate = (count / len(toks)) * 100.0
+    count = sum(marker_hits["filler"].values())
+    rate = (count / wc) * 100.0
     return rate, count
 
+_FILLER_TH = np.array([3.0, 6.0, 9.0, 12.0])
+_FILLER_PTS = np.array([15, 12, 9, 6, 3])
+
 def _score_filler_rate(filler_pct):
-    if filler_pct <= 3.0:
-        return 15
-    if filler_pct <= 6.0:
-        return 12
-    if filler_pct <= 9.0:
-        return 9
-    if filler_pct <= 12.0:
-        return 6
-    return 3
-
-def _score_sentiment(text):
-    if _vader is None:
+    # band upper bounds are inclusive (<= 3.0 -> 15)
+    return int(_FILLER_PTS[np.searchsorted(_FILLER_TH, filler_pct, side="left")])
+
+# VADER_FAST=1 scores sentiment as a NumPy sum of VADER lexicon valences over the tokens
+# (no negation / intensifier / punctuation rules). Off by default; full VADER stays the reference.
+_VADER_FAST = os.environ.get("VADER_FAST", "0") == "1"
+_VADER_ALPHA = 15  # VADER's normalization constant
+_SENTIMENT_PTS = np.array([3, 6, 9, 12, 15])
+_vader_lex_ids = None  # token -> index into _vader_lex_arr (last index = not in lexicon, 0.0)
+_vader_lex_arr = None
+_vader_lex_lock = threading.Lock()
+
+def _get_vader_lexicon():
+    """Token -> id map and valence array built once from VADER's lexicon (None if VADER is unavailable)."""
+    global _vader_lex_ids, _vader_lex_arr
+    if _vader_lex_ids is None:
+        vader = _get_vader()
+        if vader is None:
+            return None, None
+        with _vader_lex_lock:
+            if _vader_lex_ids is None:
+                words = [w for w in vader.lexicon if _WORD_RE.fullmatch(w)]
+                _vader_lex_arr = np.array([vader.lexicon[w] for w in words] + [0.0], dtype=np.float32)
+                _vader_lex_ids = {w: i for i, w in enumerate(words)}
+    return _vader_lex_ids, _vader_lex_arr
+
+def _vader_fast_compound(tokens):
+    ids, valence = _get_vader_lexicon()
+    if ids is None:
+        return None
+    oov = len(valence) - 1
+    token_ids = np.fromiter((ids.get(t, oov) for t in tokens), dtype=np.int32, count=len(tokens))
+    total = float(valence[token_ids].sum())
+    return total / math.sqrt(total * total + _VADER_ALPHA) if total else 0.0
+
+def _score_sentiment(text, tokens):
+    vader = _get_vader()
+    if vader is None:
         val = 0.5
         note = "VADER not available; using neutral fallback"
+    elif _VADER_FAST:
+        compound = _vader_fast_compound(tokens)
+        val = (compound + 1.0) / 2.0
+        note = f"VADER lexicon-sum compound raw={round(compound, 4)}"
     else:
-        vs = _vader.polarity_scores(text)
+        vs = vader.polarity_scores(text)
         val = (vs.get("compound", 0.0) + 1.0) / 2.0
         note = f"VADER compound raw={vs.get('compound',0.0)}"
-    if val >= 0.9:
-        points = 15
-    elif val >= 0.7:
-        points = 12
-    elif val >= 0.5:
-        points = 9
-    elif val >= 0.3:
-        points = 6
-    else:
-        points = 3
+    points = int(_SENTIMENT_PTS[np.searchsorted(_RATIO_TH, val, side="right")])
     return val, points, note
 
+def _semantic_similarity(txt, wc):
+    """
+    Cosine similarity of txt to the reference text.
+    Returns (sim, note); sim is None when the semantic model isn't used for this transcript.
+    """
+    if wc < _SEM_MIN_WORDS:
+        return None, "Transcript too short for semantic similarity."
+    model, util = _load_semantic_model()
+    if model is None:
+        return None, "Semantic model not available or not used."
+    try:
+        emb1 = _embed_text(txt)
+        # both embeddings are unit length, so cosine similarity is a dot product
+        return float((emb1 * _REF_EMB).sum()), ""
+    except Exception as e:
+        return None, f"Semantic compute failed: {e}"
+
 def compute_scores_for_transcript(text, duration_seconds=None):
     """
     Compute full rubric scores and return (out_dict, df_out)
     out_dict contains overall_score (0-100), word_count, sentence_count, duration_seconds_used and per_criterion list with feedback.
     df_out is a DataFrame for Excel export that now includes sentence count and duration used.
     """
+    return _compute_scores(text, duration_seconds)
+
+def _compute_scores(text, duration_seconds, semantic=None, txt_lower=None):
+    """
+    Body of compute_scores_for_transcript. semantic is an optional precomputed
+    (sim, note) pair (see _semantic_similarity) and txt_lower the already lowercased
+    stripped text, both supplied by the batch path.
+    """
     txt = str(text).strip()
-    wc = _word_count(txt)
+    # lowercase and tokenize once; every helper below works off these
+    if txt_lower is None:
+        txt_lower = txt.lower()
+    tokens = _WORD_RE.findall(txt_lower)
+    token_set = set(tokens)
+    wc = _word_count_t(tokens)
 
-    # sentence count (simple split by ., !, ? — ignoring empty items)
-    sentences = [s.strip() for s in re.split(r'[.!?]+', txt) if s.strip()]
-    sentence_count = len(sentences)
+    # sentence count (simple split by ., !, ? — ignoring empty items), counted without building the pieces
+    sentence_count = sum(1 for _ in _SENT_COUNT_RE.finditer(txt))
 
     # Use the provided duration_seconds as-is (None if not provided)
     duration_used = None
@@ -312,32 +669,25 @@ def compute_scores_for_transcript(text, duration_seconds=None):
     except Exception:
         duration_used = None
 
-    # Content & Structure
-    sal_score, sal_msg = _compute_salutation_score(txt)  # out of 5
+    # Content & Structure (keyword, salutation and flow markers found in one scan)
+    marker_hits = _scan_markers(txt_lower)
+    sal_score, sal_msg = _compute_salutation_score(marker_hits)  # out of 5
     must_keywords = _CONTENT_KEYWORDS_MUST
-    found_keywords = _detect_keywords(txt, must_keywords)
+    found_keywords = _detect_keywords(marker_hits, must_keywords)
     keyword_hits = len(found_keywords)
     keyword_score_total = min((keyword_hits * 4), 20)  # 4 points each up to 20
 
     # Flow: 5 points
-    flow_score, flow_msg = _compute_flow_score(txt)
+    flow_score, flow_msg = _compute_flow_score(marker_hits)
 
     # Semantic bonus (0-10)
-    sem_bonus = 0.0
-    sem_note = "Semantic model not available or not used."
-    model, util = _load_semantic_model()
-    if model is not None:
-        try:
-            emb1 = model.encode(txt, convert_to_tensor=True)
-            emb2 = model.encode("Introduction/self introduction content expected", convert_to_tensor=True)
-            sim = util.cos_sim(emb1, emb2).item()
-            sim_norm = max(0.0, min(1.0, (sim + 1.0) / 2.0))
-            sem_bonus = sim_norm * 10.0  # scale to 0-10
-            sem_note = f"Semantic similarity normalized={round(sim_norm,3)}"
-        except Exception as e:
-            sem_bonus = min(10.0, (keyword_hits / len(must_keywords)) * 10.0) if must_keywords else 0.0
-            sem_note = f"Semantic compute failed: {e}"
+    sim, sem_note = semantic if semantic is not None else _semantic_similarity(txt, wc)
+    if sim is not None:
+        sim_norm = max(0.0, min(1.0, (sim + 1.0) / 2.0))
+        sem_bonus = sim_norm * 10.0  # scale to 0-10
+        sem_note = f"Semantic similarity normalized={round(sim_norm,3)}"
     else:
+        # fall back to keyword coverage
         sem_bonus = min(10.0, (keyword_hits / len(must_keywords)) * 10.0) if must_keywords else 0.0
 
     content_structure_score = sal_score + keyword_score_total + flow_score + sem_bonus
@@ -347,17 +697,17 @@ def compute_scores_for_transcript(text, duration_seconds=None):
     speech_points, speech_msg = _score_speech_rate(wpm)
 
     # Language & Grammar (20 points = grammar 10 + TTR 10)
-    errors_per100, err_note = _count_grammar_errors(txt)
+    errors_per100, err_note = _count_grammar_errors(txt, txt_lower, wc)
     grammar_points = _score_grammar_errors(errors_per100)
-    ttr_val = _ttr(txt)
+    ttr_val = _ttr_from_tokens(tokens, token_set)
     ttr_points = _score_ttr(ttr_val)
 
     # Clarity (15 points) filler rate
-    filler_pct, filler_count = _filler_rate(txt)
+    filler_pct, filler_count = _filler_rate(marker_hits, wc)
     clarity_points = _score_filler_rate(filler_pct)
 
     # Engagement (15 points) sentiment
-    sentiment_val, engagement_points, sentiment_note = _score_sentiment(txt)
+    sentiment_val, engagement_points, sentiment_note = _score_sentiment(txt, tokens)
 
     per_criteria = []
 
@@ -455,3 +805,57 @@ def compute_scores_for_transcript(text, duration_seconds=None):
     df_out = pd.DataFrame(rows)
 
     return out, df_out
+
+_scores_cache = _DigestCache(maxsize=256)
+
+def compute_scores_cached(text, duration_seconds=None):
+    """
+    Memoized compute_scores_for_transcript: scoring the same transcript/duration again
+    (e.g. Score then Download Excel) returns the earlier result without recomputing.
+    Keyed by a digest of the text, so the cache doesn't keep transcripts alive.
+    The returned dict and DataFrame are shared between callers - treat them as read-only.
+    """
+    key = (_text_digest(str(text)), duration_seconds)
+    return _scores_cache.get_or_compute(
+        key, lambda: compute_scores_for_transcript(text, duration_seconds=duration_seconds)
+    )
+
+def compute_scores_for_transcript_batch(texts, durations=None, batch_size=32):
+    """
+    Score several transcripts at once; returns a list of (out_dict, df_out) in input order.
+    The semantic model encodes all eligible transcripts in batched calls and LanguageTool
+    checks run concurrently in a thread pool (the work happens in the LanguageTool server).
+    durations is an optional list of duration_seconds aligned with texts.
+    """
+    txts = [str(t).strip() for t in texts]
+    if durations is None:
+        durations = [None] * len(txts)
+    lowered = [t.lower() for t in txts]
+    word_counts = [len(_WORD_RE.findall(t)) for t in lowered]
+
+    # semantic similarities for all transcripts long enough, in one batched encode
+    semantic = [None] * len(txts)
+    eligible = [i for i, wc in enumerate(word_counts) if wc >= _SEM_MIN_WORDS]
+    model, util = _load_semantic_model() if eligible else (None, None)
+    if model is not None:
+        try:
+            embs = model.encode([txts[i] for i in eligible], batch_size=batch_size,
+                                convert_to_tensor=True, normalize_embeddings=True)
+            sims = (embs @ _REF_EMB).tolist()
+            for i, sim in zip(eligible, sims):
+                semantic[i] = (float(sim), "")
+        except Exception as e:
+            for i in eligible:
+                semantic[i] = (None, f"Semantic compute failed: {e}")
+
+    # warm the LanguageTool cache concurrently; the per-transcript pass then hits the cache
+    if _get_lt() is not None:
+        pending = list({t for t, wc in zip(txts, word_counts) if wc})
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as pool:
+                list(pool.map(_lt_error_count, pending))
+
+    return [
+        _compute_scores(t, d, sem, txt_lower=tl)
+        for t, tl, d, sem in zip(txts, lowered, durations, semantic)
+    ]
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production: gunicorn --preload wsgi:app
+
+With --preload this module is imported once in the gunicorn master, so scoring.warmup()
+loads the models before the workers fork and they share those pages copy-on-write.
+"""
+import scoring
+from app import app
+
+scoring.warmup()